@@ -0,0 +1,42 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import unittest
+import mock
+
+from azure.mgmt.web import WebSiteManagementClient
+from azure.cli.core.adal_authentication import AdalAuthentication
+
+# stateless, so a single instance can back every client the tests create
+_CREDENTIALS = AdalAuthentication(lambda: ('bearer', 'secretToken'))
+
+# stands in for the 'cmd' argument of commands whose tests never inspect it
+DUMMY_CMD = mock.MagicMock(name='dummy_cmd')
+
+
+class WebappMockTestCase(unittest.TestCase):
+    # every test is isolated through mocks, so nose's multiprocess plugin may spread them across workers
+    _multiprocess_can_split_ = True
+
+    _client = None
+
+    @property
+    def client(self):
+        # built on first use, as most tests mock web_client_factory and never touch the real client
+        if self._client is None:
+            self._client = WebSiteManagementClient(_CREDENTIALS, '123455678')
+        return self._client
+
+    def _swap(self, owner, name):
+        # plain attribute swap restored through addCleanup; cheaper than stacking mock.patch decorators
+        original = getattr(owner, name)
+        replacement = mock.MagicMock()
+        setattr(owner, name, replacement)
+        self.addCleanup(setattr, owner, name, original)
+        return replacement
+
+
+class FakedResponse(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, status_code):
+        self.status_code = status_code
@@ -0,0 +1,70 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import unittest
+import mock
+
+from azure.mgmt.web.models import (Site, HostNameSslState, SslState,
+                                   AddressResponse, HostingEnvironmentProfile)
+from azure.cli.command_modules.appservice import custom
+from azure.cli.command_modules.appservice.custom import get_external_ip
+
+from .appservice_test_util import WebappMockTestCase, DUMMY_CMD
+
+
+class TestWebappExternalIpMocked(WebappMockTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # read-only model graphs shared by the ASE tests, so they are built once per class
+        cls.host_env = HostingEnvironmentProfile('id11')
+        cls.host_env.name = 'ase1'
+        cls.host_env.resource_group = 'myRg'
+        cls.ip_based_site = Site('antarctica', hosting_environment_profile=cls.host_env,
+                                 host_name_ssl_states=[HostNameSslState(ssl_state=SslState.ip_based_enabled,
+                                                                        virtual_ip='1.2.3.4')])
+        cls.sni_site = Site('antarctica', hosting_environment_profile=cls.host_env,
+                            host_name_ssl_states=[HostNameSslState(ssl_state=SslState.sni_enabled)])
+
+    def _get_external_ip_from_ase(self, site, vips):
+        client = mock.Mock()
+        client.web_apps.get.return_value = site
+        client.app_service_environments.list_vips.return_value = vips
+        self._swap(custom, 'web_client_factory').return_value = client
+        return get_external_ip(DUMMY_CMD, 'myRg', 'myWeb')['ip']
+
+    def test_get_external_ip_from_ase_ip_based_ssl(self):
+        # the web inside a ASE, with an ip based ssl binding, we return the virtual ip from the binding
+        self.assertEqual('1.2.3.4', self._get_external_ip_from_ase(self.ip_based_site, AddressResponse()))
+
+    def test_get_external_ip_from_ase_ilb(self):
+        # no ip based ssl binding, but it is in an internal load balancer, we take the ILB address
+        self.assertEqual('4.3.2.1', self._get_external_ip_from_ase(self.sni_site,
+                                                                   AddressResponse(internal_ip_address='4.3.2.1')))
+
+    def test_get_external_ip_from_ase_service_ip(self):
+        # no ip based ssl binding, and not in internal load balancer, we take service ip
+        self.assertEqual('1.1.1.1', self._get_external_ip_from_ase(self.sni_site,
+                                                                   AddressResponse(service_ip_address='1.1.1.1')))
+
+    @mock.patch('azure.cli.command_modules.appservice.custom.web_client_factory')
+    @mock.patch('azure.cli.command_modules.appservice.custom._resolve_hostname_through_dns')
+    def test_get_external_ip_from_dns(self, resolve_hostname_mock, client_factory_mock):
+        client = mock.Mock()
+        client_factory_mock.return_value = client
+
+        # set up the web inside a ASE, with an ip based ssl binding
+        site = Site('antarctica')
+        site.default_host_name = 'myweb.com'
+        client.web_apps.get.return_value = site
+
+        # action
+        get_external_ip(DUMMY_CMD, 'myRg', 'myWeb')
+
+        # assert, we return the virtual ip from the ip based ssl binding
+        resolve_hostname_mock.assert_called_with('myweb.com')
+
+
+if __name__ == '__main__':
+    unittest.main()
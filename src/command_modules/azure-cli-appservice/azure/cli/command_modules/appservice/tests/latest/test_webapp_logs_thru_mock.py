@@ -0,0 +1,67 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+import threading
+import unittest
+import mock
+
+from azure.cli.command_modules.appservice import custom
+from azure.cli.command_modules.appservice.custom import get_streaming_log, download_historical_logs
+
+from .appservice_test_util import WebappMockTestCase
+
+
+class TestWebappLogsMocked(WebappMockTestCase):
+
+    def test_log_stream_supply_cli_ctx(self):
+        threading_mock = self._swap(threading, 'Thread')
+        get_scm_url_mock = self._swap(custom, '_get_scm_url')
+        site_op_mock = self._swap(custom, '_generic_site_operation')
+
+        # test exception to exit the streaming loop
+        class ErrorToExitInfiniteLoop(Exception):
+            pass
+
+        threading_mock.side_effect = ErrorToExitInfiniteLoop('Expected error to exit early')
+        get_scm_url_mock.return_value = 'http://great_url'
+        cmd_mock = mock.MagicMock()
+        cli_ctx_mock = mock.MagicMock()
+        cmd_mock.cli_ctx = cli_ctx_mock
+
+        try:
+            # action
+            get_streaming_log(cmd_mock, 'rg', 'web1')
+            self.fail('test exception was not thrown')
+        except ErrorToExitInfiniteLoop:
+            # assert
+            site_op_mock.assert_called_with(cli_ctx_mock, 'rg', 'web1', 'list_publishing_credentials', None)
+
+    def test_download_log_supply_cli_ctx(self):
+        get_log_mock = self._swap(custom, '_get_log')
+        get_scm_url_mock = self._swap(custom, '_get_scm_url')
+        site_op_mock = self._swap(custom, '_generic_site_operation')
+
+        def test_result():
+            res = mock.MagicMock()
+            res.publishing_user_name, res.publishing_password = 'great_user', 'secret_password'
+            return res
+        test_scm_url = 'http://great_url'
+        get_scm_url_mock.return_value = test_scm_url
+        publish_cred_mock = mock.MagicMock()
+        publish_cred_mock.result = test_result
+        site_op_mock.return_value = publish_cred_mock
+        cmd_mock = mock.MagicMock()
+        cli_ctx_mock = mock.MagicMock()
+        cmd_mock.cli_ctx = cli_ctx_mock
+
+        # action
+        download_historical_logs(cmd_mock, 'rg', 'web1')
+
+        # assert
+        site_op_mock.assert_called_with(cli_ctx_mock, 'rg', 'web1', 'list_publishing_credentials', None)
+        get_log_mock.assert_called_with(test_scm_url + '/dump', 'great_user', 'secret_password', None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -33,6 +33,12 @@ def execute(args):
     from .main import run_tests, collect_test
 
     validate_usage(args)
+    if args.last_failed:
+        # replay the failures recorded by the previous run
+        if not os.path.isfile(args.dest_file) or not os.path.getsize(args.dest_file):
+            display("No failed tests recorded in '{}'.".format(args.dest_file))
+            sys.exit(0)
+        args.src_file = args.dest_file
     current_profile = get_current_profile(args)
     test_index = get_test_index(args)
     modules = []
@@ -88,11 +94,15 @@ def execute(args):
 
 def validate_usage(args):
     """ Ensure conflicting options aren't specified. """
-    test_usage = '[--test TESTS [TESTS ...]] [--src-file FILENAME]'
+    test_usage = '[--test TESTS [TESTS ...]] [--src-file FILENAME | --last-failed]'
     ci_usage = '--ci'
 
+    if args.src_file and args.last_failed:
+        display('usage error: --src-file FILENAME | --last-failed')
+        sys.exit(1)
+
     usages = []
-    if args.tests or args.src_file:
+    if args.tests or args.src_file or args.last_failed:
         usages.append(test_usage)
     if args.ci:
         usages.append(ci_usage)
@@ -295,6 +305,8 @@ def setup_arguments(parser):
                         help='Space separated list of tests to run. Can specify test filenames, class name or individual method names.')
     parser.add_argument('--src-file', dest='src_file', help='Text file of test names to include in the the test run.')
     parser.add_argument('--dest-file', dest='dest_file', help='File in which to save the names of any test failures.', default='test_failures.txt')
+    parser.add_argument('--last-failed', dest='last_failed', action='store_true',
+                        help='Re-run only the tests that failed in the previous run, as recorded in the --dest-file.')
     parser.add_argument('--ci', dest='ci', action='store_true', help='Run the tests in CI mode.')
     parser.add_argument('--discover', dest='discover', action='store_true', help='Build an index of test names so that you don\'t need to specify '
                                                                                  'fully qualified paths when using --tests.')